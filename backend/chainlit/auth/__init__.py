@@ -1,3 +1,5 @@
+import functools
+import json
 import os
 
 from fastapi import Depends, HTTPException, Request, Response
@@ -20,6 +22,7 @@ from .jwt import (
     create_jwt,
     decode_client_side_session,
     decode_jwt,
+    decode_jwt_cached,
     encode_client_side_session,
     get_jwt_secret,
 )
@@ -34,10 +37,12 @@ def ensure_jwt_secret():
         )
 
 
+@functools.lru_cache(maxsize=1)
 def is_oauth_enabled():
     return config.code.oauth_callback and len(get_configured_oauth_providers()) > 0
 
 
+@functools.lru_cache(maxsize=1)
 def require_login():
     return (
         bool(os.environ.get("CHAINLIT_CUSTOM_AUTH"))
@@ -47,13 +52,21 @@ def require_login():
     )
 
 
+def invalidate_auth_cache():
+    """Clear the memoized auth settings, to be called whenever they may have changed."""
+    get_configured_oauth_providers.cache_clear()
+    is_oauth_enabled.cache_clear()
+    require_login.cache_clear()
+    get_configuration_json.cache_clear()
+
+
 def get_configuration():
     return {
         "requireLogin": require_login(),
         "passwordAuth": config.code.password_auth_callback is not None,
         "headerAuth": config.code.header_auth_callback is not None,
         "oauthProviders": (
-            get_configured_oauth_providers() if is_oauth_enabled() else []
+            get_configured_oauth_providers() if is_oauth_enabled() else ()
         ),
         "default_theme": config.ui.default_theme,
         "ui": {
@@ -64,9 +77,20 @@ def get_configuration():
     }
 
 
+@functools.lru_cache(maxsize=1)
+def get_configuration_json() -> bytes:
+    """Return `get_configuration()` pre-serialized, as it only changes on reload."""
+    return json.dumps(
+        get_configuration(),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
 async def authenticate_user(token: str = Depends(reuseable_oauth)):
     try:
-        user = decode_jwt(token)
+        user = decode_jwt_cached(token)
     except Exception as e:
         raise HTTPException(
             status_code=401, detail="Invalid authentication token"
@@ -124,10 +148,13 @@ __all__ = [
     "clear_auth_cookie",
     "clear_client_side_session",
     "create_jwt",
+    "decode_jwt",
     "get_client_side_session",
     "get_configuration",
+    "get_configuration_json",
     "get_current_user",
     "get_token_from_cookies",
+    "invalidate_auth_cache",
     "set_auth_cookie",
     "update_client_side_session",
 ]
@@ -1,12 +1,28 @@
+import hashlib
+import json
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import jwt as pyjwt
 
 from chainlit.config import config
 from chainlit.user import User
 
+""" Module level JWT decoder, with the signature verification pinned. """
+_jwt_algorithms = ["HS256"]
+_jwt_decoder = pyjwt.PyJWT(options={"verify_signature": True})
+
+""" Module level cache of verified JWT claims. """
+_jwt_cache_ttl = 30  # 30s
+_jwt_cache_maxsize = 10000
+# Entries hold their expiry, the token exp claim and the claims. Claims are
+# stored serialized so callers never share mutable state
+_jwt_cache: Dict[bytes, Tuple[float, float, str]] = {}
+_jwt_cache_lock = threading.Lock()
+
 
 def get_jwt_secret() -> Optional[str]:
     return os.environ.get("CHAINLIT_AUTH_SECRET")
@@ -39,27 +55,71 @@ def encode_client_side_session(client_side_session: Dict[str, Any]):
     return pyjwt.encode(client_side_session, get_jwt_secret(), algorithm="HS256")
 
 
-def decode_jwt(token: str) -> User:
+def _decode_jwt_claims(token: str) -> Dict[str, Any]:
     secret = get_jwt_secret()
     assert secret
 
-    dict = pyjwt.decode(
-        token,
-        secret,
-        algorithms=["HS256"],
-        options={"verify_signature": True},
-    )
+    return _jwt_decoder.decode(token, secret, algorithms=_jwt_algorithms)
+
+
+def decode_jwt(token: str) -> User:
+    dict = _decode_jwt_claims(token)
     del dict["exp"]
     return User(**dict)
 
 
+def _jwt_cache_key(token: str) -> bytes:
+    return hashlib.sha256(f"{get_jwt_secret()}:{token}".encode()).digest()[:16]
+
+
+def get_jwt_expiration(token: str) -> Optional[float]:
+    """
+    Return the `exp` claim of a token recently verified by `decode_jwt_cached`,
+    without decoding it again. Returns None if the token is not cached.
+    """
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(_jwt_cache_key(token))
+    return cached[1] if cached else None
+
+
+def decode_jwt_cached(token: str) -> User:
+    """
+    Same as `decode_jwt`, but reuses the verified claims of recently seen tokens.
+
+    Entries never outlive the token's own `exp` claim and failed validations
+    are never cached.
+    """
+    key = _jwt_cache_key(token)
+    now = time.time()
+
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(key)
+        if cached and cached[0] <= now:
+            # Expired entries are dropped lazily, on lookup
+            del _jwt_cache[key]
+            cached = None
+    if cached:
+        return User(**json.loads(cached[2]))
+
+    claims = _decode_jwt_claims(token)
+    exp = float(claims.pop("exp"))
+    expires_at = min(exp, now + _jwt_cache_ttl)
+
+    with _jwt_cache_lock:
+        if key not in _jwt_cache and len(_jwt_cache) >= _jwt_cache_maxsize:
+            # Dicts are insertion ordered: evict the oldest entry
+            del _jwt_cache[next(iter(_jwt_cache))]
+        _jwt_cache[key] = (expires_at, exp, json.dumps(claims))
+
+    return User(**claims)
+
+
 def decode_client_side_session(encoded_client_side_session: str) -> Dict[str, Any]:
     try:
-        client_side_session = pyjwt.decode(
+        client_side_session = _jwt_decoder.decode(
             encoded_client_side_session,
             get_jwt_secret(),
-            algorithms=["HS256"],
-            options={"verify_signature": True},
+            algorithms=_jwt_algorithms,
         )
     except pyjwt.InvalidSignatureError:
         return {}
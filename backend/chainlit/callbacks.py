@@ -6,6 +6,7 @@ from mcp import ClientSession
 from starlette.datastructures import Headers
 
 from chainlit.action import Action
+from chainlit.auth import invalidate_auth_cache
 from chainlit.config import config
 from chainlit.context import context
 from chainlit.data.base import BaseDataLayer
@@ -80,6 +81,7 @@ def password_auth_callback(
     """
 
     config.code.password_auth_callback = wrap_user_function(func)
+    invalidate_auth_cache()
     return func
 
 
@@ -101,6 +103,7 @@ def header_auth_callback(
     """
 
     config.code.header_auth_callback = wrap_user_function(func)
+    invalidate_auth_cache()
     return func
 
 
@@ -129,6 +132,7 @@ def oauth_callback(
         )
 
     config.code.oauth_callback = wrap_user_function(func)
+    invalidate_auth_cache()
     return func
 
 
@@ -1,4 +1,5 @@
 import base64
+import functools
 import os
 import urllib.parse
 from typing import Dict, List, Optional, Tuple
@@ -852,5 +853,7 @@ def get_oauth_provider(provider: str) -> Optional[OAuthProvider]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_configured_oauth_providers():
-    return [p.id for p in providers if p.is_configured()]
+    # Memoized and shared between callers, hence immutable
+    return tuple(p.id for p in providers if p.is_configured())
@@ -40,8 +40,9 @@ from chainlit.auth import (
     create_jwt,
     decode_jwt,
     get_client_side_session,
-    get_configuration,
+    get_configuration_json,
     get_current_user,
+    invalidate_auth_cache,
     update_client_side_session,
 )
 from chainlit.auth.cookie import (
@@ -145,6 +146,8 @@ async def lifespan(app: FastAPI):
                             except Exception as e:
                                 logger.error(f"Error reloading module: {e}")
 
+                        invalidate_auth_cache()
+
                         await asyncio.sleep(1)
                         await sio.emit("reload", {})
 
@@ -478,7 +481,7 @@ def get_user_facing_url(url: URL):
 
 @router.get("/auth/config")
 async def auth(request: Request):
-    return get_configuration()
+    return Response(content=get_configuration_json(), media_type="application/json")
 
 
 def _get_response_dict(access_token: str) -> dict:
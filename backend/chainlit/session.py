@@ -1,14 +1,16 @@
 import asyncio
+import functools
+import hmac
 import json
 import mimetypes
 import re
 import shutil
+import time
 import uuid
 from contextlib import AsyncExitStack
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Literal, Optional, Union
 
-import aiofiles
-
 from chainlit.logger import logger
 from chainlit.types import AskFileSpec, FileReference
 
@@ -19,38 +21,127 @@ if TYPE_CHECKING:
     from chainlit.types import FileDict
     from chainlit.user import PersistedUser, User
 
+# Deployments only see a handful of mime types, memoize their extension lookup
+_guess_extension = functools.lru_cache(maxsize=256)(mimetypes.guess_extension)
+
 ClientType = Literal["webapp", "copilot", "teams", "slack", "discord"]
 
 
 class JSONEncoderIgnoreNonSerializable(json.JSONEncoder):
     def default(self, o):
-        try:
-            return super().default(o)
-        except TypeError:
-            return None
+        # The base implementation only raises a TypeError, skip building it
+        return None
+
+
+# Escape non ASCII characters: the size limit applies to the escaped form, which
+# is also what data layers store with json.dumps defaults.
+_metadata_encoder = JSONEncoderIgnoreNonSerializable(ensure_ascii=True)
+
+
+_json_native_types = frozenset((str, dict, list, int, float, bool, type(None)))
+
+
+def _escaped_size_bound(s: str) -> int:
+    # Escaped ASCII takes at most 6 bytes per character (\u00XX), anything
+    # else at most 12 (a \uXXXX\uXXXX surrogate pair). Plus the quotes.
+    return len(s) * (6 if s.isascii() else 12) + 2
+
+
+def _fast_size(o: Any, limit: int) -> int:
+    """
+    Upper bound of the JSON size of `o`, stopping as soon as it exceeds `limit`.
+
+    Raises a TypeError if `o` holds anything else than JSON native types.
+    """
+    size = 0
+    stack = [o]
+    while stack and size <= limit:
+        o = stack.pop()
+        t = type(o)
+        if t is str:
+            size += _escaped_size_bound(o)
+        elif t is dict:
+            size += 2
+            for k, v in o.items():
+                if type(k) is not str:
+                    raise TypeError(f"Non string key: {k!r}")
+                # Fail before walking sibling containers, which may be large
+                if type(v) not in _json_native_types:
+                    raise TypeError(f"Non JSON native type: {type(v).__name__}")
+                # Key, ": " and ", " separators
+                size += _escaped_size_bound(k) + 4
+                stack.append(v)
+        elif t is list:
+            size += 2 + 2 * len(o)
+            stack.extend(o)
+        elif t is int:
+            size += len(str(o))
+        elif t is float:
+            size += 24
+        elif t is bool or o is None:
+            size += 5
+        else:
+            raise TypeError(f"Non JSON native type: {t.__name__}")
+
+    return size
 
 
 def clean_metadata(metadata: Dict, max_size: int = 1048576):
-    cleaned_metadata = json.loads(
-        json.dumps(metadata, cls=JSONEncoderIgnoreNonSerializable, ensure_ascii=False)
-    )
+    """
+    Drop non serializable values from `metadata`, or redact it if too large.
 
-    metadata_size = len(json.dumps(cleaned_metadata).encode("utf-8"))
-    if metadata_size > max_size:
+    When `metadata` only holds JSON native values and is small enough, it is
+    returned as is, sharing its nested values with the caller. It is meant to
+    be serialized right away, not kept around.
+    """
+    # Most sessions only hold JSON native values: skip the serialization when
+    # even the worst case size fits.
+    try:
+        if _fast_size(metadata, max_size) <= max_size:
+            return metadata
+    except TypeError:
+        pass
+
+    # Serialize once: the encoded payload is used both to measure the size
+    # and to rebuild the cleaned metadata. It is pure ASCII, so its length
+    # is its size in bytes.
+    serialized = _metadata_encoder.encode(metadata)
+
+    if len(serialized) > max_size:
         # Redact the metadata if it exceeds the maximum size
-        cleaned_metadata = {
+        return {
             "message": f"Metadata size exceeds the limit of {max_size} bytes. Redacted."
         }
 
-    return cleaned_metadata
+    return json.loads(serialized)
 
 
 class BaseSession:
     """Base object."""
 
-    thread_id_to_resume: Optional[str] = None
+    # Sessions are long lived and numerous, avoid a per instance __dict__
+    __slots__ = (
+        "_files_dir",
+        "chat_profile",
+        "chat_settings",
+        "client_side_session",
+        "client_type",
+        "current_task",
+        "environ",
+        "files",
+        "files_spec",
+        "has_first_interaction",
+        "id",
+        "thread_id",
+        "thread_id_to_resume",
+        "token",
+        "user",
+        "user_env",
+    )
+
+    thread_id_to_resume: Optional[str]
     client_type: ClientType
-    current_task: Optional[asyncio.Task] = None
+    current_task: Optional[asyncio.Task]
 
     def __init__(
         self,
@@ -72,8 +163,10 @@ class BaseSession:
         # Client-side Session
         client_side_session: Optional[Dict[str, Any]] = None,
     ):
-        if thread_id:
-            self.thread_id_to_resume = thread_id
+        from chainlit.config import FILES_DIRECTORY
+
+        self.thread_id_to_resume = thread_id or None
+        self.current_task = None
         self.thread_id = thread_id or str(uuid.uuid4())
         self.user = user
         self.client_type = client_type
@@ -87,16 +180,15 @@ class BaseSession:
         self.files_spec: Dict[str, AskFileSpec] = {}
 
         self.id = id
+        self._files_dir = FILES_DIRECTORY / id
 
         self.chat_settings: Dict[str, Any] = {}
 
         self.client_side_session: Optional[Dict[str, Any]] = client_side_session
 
     @property
-    def files_dir(self):
-        from chainlit.config import FILES_DIRECTORY
-
-        return FILES_DIRECTORY / self.id
+    def files_dir(self) -> Path:
+        return self._files_dir
 
     async def persist_file(
         self,
@@ -116,24 +208,20 @@ class BaseSession:
 
         file_path = self.files_dir / file_id
 
-        file_extension = mimetypes.guess_extension(mime)
+        file_extension = _guess_extension(mime)
 
         if file_extension:
             file_path = file_path.with_suffix(file_extension)
 
         if path:
-            # Copy the file from the given path
-            async with (
-                aiofiles.open(path, "rb") as src,
-                aiofiles.open(file_path, "wb") as dst,
-            ):
-                await dst.write(await src.read())
+            # Copy the file from the given path in a single worker thread hop,
+            # letting the kernel use zero-copy primitives when available
+            await asyncio.to_thread(shutil.copyfile, path, file_path)
         elif content:
-            # Write the provided content to the file
-            async with aiofiles.open(file_path, "wb") as buffer:
-                if isinstance(content, str):
-                    content = content.encode("utf-8")
-                await buffer.write(content)
+            # Write the provided content to the file in a single worker thread hop
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            await asyncio.to_thread(file_path.write_bytes, content)
 
         # Get the file size
         file_size = file_path.stat().st_size
@@ -163,6 +251,11 @@ class BaseSession:
             # Remove user environment variables (API keys) before persisting to database
             user_session_copy["env"] = {}
 
+        # The user is not JSON serializable and would be stored as null anyway,
+        # doing it here keeps clean_metadata on its fast path.
+        if "user" in user_session_copy:
+            user_session_copy["user"] = None
+
         metadata = clean_metadata(user_session_copy)
         return metadata
 
@@ -170,6 +263,8 @@ class BaseSession:
 class HTTPSession(BaseSession):
     """Internal HTTP session object. Used to consume Chainlit through API (no websocket)."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         # Id of the session
@@ -204,6 +299,52 @@ class HTTPSession(BaseSession):
 ThreadQueue = Deque[tuple[Callable, object, tuple, Dict]]
 
 
+# Upper bound of data layer calls running at once while flushing a queue
+_flush_concurrency = 8
+
+
+def _queued_call_target(args: tuple) -> Optional[str]:
+    """Return the id of the step or element a queued data layer call works on."""
+    if not args:
+        return None
+    target = args[0]
+    if isinstance(target, str):
+        return target
+    if isinstance(target, dict):
+        return target.get("id")
+    return getattr(target, "id", None)
+
+
+def _queued_call_parent(args: tuple) -> Optional[str]:
+    """Return the id of the parent step of a queued data layer call, if any."""
+    if not args:
+        return None
+    target = args[0]
+    if isinstance(target, dict):
+        return target.get("parentId")
+    return getattr(target, "parent_id", None)
+
+
+def _queued_call_root(
+    target: Optional[str], parents: Dict[Optional[str], Optional[str]]
+) -> Optional[str]:
+    """Follow `target` up to its oldest ancestor queued in the same batch."""
+    seen = set()
+    while parents.get(target) in parents and target not in seen:
+        seen.add(target)
+        target = parents[target]
+    return target
+
+
+async def _flush_calls(method_name: str, calls: list, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        for method, instance, args, kwargs in calls:
+            try:
+                await method(instance, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error while flushing {method_name}: {e}")
+
+
 class WebsocketSession(BaseSession):
     """Internal web socket session object.
 
@@ -216,7 +357,20 @@ class WebsocketSession(BaseSession):
     socket id for convenience.
     """
 
-    to_clear: bool = False
+    __slots__ = (
+        "config",
+        "emit",
+        "emit_call",
+        "language",
+        "mcp_sessions",
+        "restored",
+        "socket_id",
+        "thread_queues",
+        "to_clear",
+        "token_exp",
+    )
+
+    to_clear: bool
 
     mcp_sessions: dict[str, tuple["ClientSession", AsyncExitStack]]
 
@@ -245,6 +399,8 @@ class WebsocketSession(BaseSession):
         chat_profile: Optional[str] = None,
         # Client-side Session
         client_side_session: Optional[Dict[str, Any]] = None,
+        # Expiration timestamp of the logged-in user token
+        token_exp: Optional[float] = None,
     ):
         super().__init__(
             id=id,
@@ -258,11 +414,13 @@ class WebsocketSession(BaseSession):
             client_side_session=client_side_session,
         )
 
+        self.token_exp = token_exp
         self.socket_id = socket_id
         self.emit_call = emit_call
         self.emit = emit
 
         self.restored = False
+        self.to_clear = False
 
         self.thread_queues: Dict[str, ThreadQueue] = {}
         self.mcp_sessions = {}
@@ -279,7 +437,7 @@ class WebsocketSession(BaseSession):
         self.config: ChainlitConfig = self.get_config()
 
         ws_sessions_id[self.id] = self
-        ws_sessions_sid[socket_id] = self
+        ws_sid_to_id[socket_id] = self.id
 
     def get_config(self) -> "ChainlitConfig":
         """
@@ -316,8 +474,8 @@ class WebsocketSession(BaseSession):
 
     def restore(self, new_socket_id: str):
         """Associate a new socket id to the session."""
-        ws_sessions_sid.pop(self.socket_id, None)
-        ws_sessions_sid[new_socket_id] = self
+        ws_sid_to_id.pop(self.socket_id, None)
+        ws_sid_to_id[new_socket_id] = self.id
         self.socket_id = new_socket_id
         self.restored = True
 
@@ -325,7 +483,7 @@ class WebsocketSession(BaseSession):
         """Delete the session."""
         if self.files_dir.is_dir():
             shutil.rmtree(self.files_dir)
-        ws_sessions_sid.pop(self.socket_id, None)
+        ws_sid_to_id.pop(self.socket_id, None)
         ws_sessions_id.pop(self.id, None)
 
         for _, exit_stack in self.mcp_sessions.values():
@@ -335,24 +493,60 @@ class WebsocketSession(BaseSession):
                 pass
 
     async def flush_method_queue(self):
+        semaphore = asyncio.Semaphore(_flush_concurrency)
         for method_name, queue in self.thread_queues.items():
-            while queue:
-                method, self, args, kwargs = queue.popleft()
-                try:
-                    await method(self, *args, **kwargs)
-                except Exception as e:
-                    logger.error(f"Error while flushing {method_name}: {e}")
+            calls = list(queue)
+            queue.clear()
+
+            parents: Dict[Optional[str], Optional[str]] = {}
+            for call in calls:
+                target = _queued_call_target(call[2])
+                if target is not None:
+                    parents[target] = _queued_call_parent(call[2])
+
+            # Calls on the same step/element keep their order, and so do calls
+            # on steps whose parent is queued in the same batch: a child never
+            # runs before its parent. Other calls are flushed concurrently.
+            calls_by_root: Dict[Optional[str], list] = {}
+            for call in calls:
+                root = _queued_call_root(_queued_call_target(call[2]), parents)
+                calls_by_root.setdefault(root, []).append(call)
+
+            await asyncio.gather(
+                *(
+                    _flush_calls(method_name, group, semaphore)
+                    for group in calls_by_root.values()
+                )
+            )
 
     @classmethod
     def get(cls, socket_id: str):
         """Get session by socket id."""
-        return ws_sessions_sid.get(socket_id)
+        return ws_sessions_id.get(ws_sid_to_id.get(socket_id, ""))
 
     @classmethod
     def get_by_id(cls, session_id: str):
         """Get session by session id."""
         return ws_sessions_id.get(session_id)
 
+    @classmethod
+    def authenticate_for_reconnect(cls, session_id: str, token: str):
+        """
+        Return an existing session if it was opened with the same, still valid,
+        token. Lets reconnecting sockets skip the token decoding.
+        """
+        session = cls.get_by_id(session_id)
+        if (
+            session
+            and session.user
+            and session.token
+            and session.token_exp
+            and time.time() < session.token_exp
+            and hmac.compare_digest(session.token, token)
+        ):
+            return session
+        return None
+
     @classmethod
     def require(cls, socket_id: str):
         """Throws an exception if the session is not found."""
@@ -361,5 +555,6 @@ class WebsocketSession(BaseSession):
         raise ValueError("Session not found")
 
 
-ws_sessions_sid: Dict[str, WebsocketSession] = {}
 ws_sessions_id: Dict[str, WebsocketSession] = {}
+# Socket ids are ephemeral, only keep a mapping to the session id
+ws_sid_to_id: Dict[str, str] = {}
@@ -12,7 +12,7 @@ from chainlit.auth import (
     get_token_from_cookies,
     require_login,
 )
-from chainlit.auth.jwt import decode_client_side_session
+from chainlit.auth.jwt import decode_client_side_session, get_jwt_expiration
 from chainlit.chat_context import chat_context
 from chainlit.config import ChainlitConfig, config
 from chainlit.context import init_ws_context
@@ -35,12 +35,18 @@ WSGIEnvironment: TypeAlias = dict[str, Any]
 THREAD_NOT_FOUND_MSG = "Thread not found."
 
 
-def restore_existing_session(sid, session_id, emit_fn, emit_call_fn):
+def restore_existing_session(
+    sid, session_id, emit_fn, emit_call_fn, token=None, token_exp=None
+):
     """Restore a session from the sessionId provided by the client."""
     if session := WebsocketSession.get_by_id(session_id):
         session.restore(new_socket_id=sid)
         session.emit = emit_fn
         session.emit_call = emit_call_fn
+        if token:
+            # Keep the reconnection shortcut on the latest authenticated token
+            session.token = token
+            session.token_exp = token_exp
         return True
     return False
 
@@ -119,23 +125,33 @@ def _get_client_side_session(environ: WSGIEnvironment) -> Optional[Dict[str, Any
 async def _authenticate_connection(
     environ,
     auth,
-) -> Union[Tuple[Union[User, PersistedUser], str], Tuple[None, None]]:
+) -> Union[
+    Tuple[Union[User, PersistedUser], str, Optional[float]], Tuple[None, None, None]
+]:
+    """Return the user, its token and the token expiry."""
     if token := _get_token(environ, auth):
+        # A reconnecting socket presenting its session token is already known
+        if session := WebsocketSession.authenticate_for_reconnect(
+            auth.get("sessionId"), token
+        ):
+            return session.user, token, session.token_exp
+
         user = await get_current_user(token=token)
         if user:
-            return user, token
+            # The token was just verified, its claims are cached
+            return user, token, get_jwt_expiration(token)
 
-    return None, None
+    return None, None, None
 
 
 @sio.on("connect")  # pyright: ignore [reportOptionalCall]
 async def connect(sid, environ, auth):
-    user = token = None
+    user = token = token_exp = None
     client_side_session = None
 
     if require_login():
         try:
-            user, token = await _authenticate_connection(environ, auth)
+            user, token, token_exp = await _authenticate_connection(environ, auth)
             client_side_session = _get_client_side_session(environ)
         except Exception as e:
             logger.exception("Exception authenticating connection: %s", e)
@@ -153,7 +169,9 @@ async def connect(sid, environ, auth):
         return sio.call(event, data, timeout=timeout, to=sid)
 
     session_id = auth.get("sessionId")
-    if restore_existing_session(sid, session_id, emit_fn, emit_call_fn):
+    if restore_existing_session(
+        sid, session_id, emit_fn, emit_call_fn, token=token, token_exp=token_exp
+    ):
         return True
 
     user_env_string = auth.get("userEnv")
@@ -177,6 +195,7 @@ async def connect(sid, environ, auth):
         thread_id=auth.get("threadId"),
         environ=environ,
         client_side_session=client_side_session,
+        token_exp=token_exp,
     )
 
     return True
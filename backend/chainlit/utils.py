@@ -7,10 +7,10 @@ from datetime import datetime, timezone
 from typing import Callable
 
 import click
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from packaging import version
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from chainlit.auth import ensure_jwt_secret
 from chainlit.context import context
@@ -38,22 +38,21 @@ def wrap_user_function(user_function: Callable, with_task=False) -> Callable:
         Callable: The wrapped function.
     """
 
+    # Get the parameter names of the user-defined function once, at wrap time
+    user_function_params = tuple(inspect.signature(user_function).parameters.keys())
+    is_coroutine = inspect.iscoroutinefunction(user_function)
+
     @functools.wraps(user_function)
     async def wrapper(*args):
-        # Get the parameter names of the user-defined function
-        user_function_params = list(inspect.signature(user_function).parameters.keys())
-
         # Create a dictionary of parameter names and their corresponding values from *args
-        params_values = {
-            param_name: arg for param_name, arg in zip(user_function_params, args)
-        }
+        params_values = dict(zip(user_function_params, args))
 
         if with_task:
             await context.emitter.task_start()
 
         try:
             # Call the user-defined function with the arguments
-            if inspect.iscoroutinefunction(user_function):
+            if is_coroutine:
                 return await user_function(**params_values)
             else:
                 return user_function(**params_values)
@@ -89,6 +88,7 @@ def make_module_getattr(registry):
     return __getattr__
 
 
+@functools.cache
 def check_module_version(name, required_version):
     """
     Check the version of a module.
@@ -150,7 +150,7 @@ def mount_chainlit(app: FastAPI, target: str, path="/chainlit"):
 
     ensure_jwt_secret()
 
-    class ChainlitMiddleware(BaseHTTPMiddleware):
+    class ChainlitMiddleware:
         """Middleware to handle path routing for submounted Chainlit applications.
 
         When Chainlit is submounted within a larger FastAPI application, its default route
@@ -160,13 +160,23 @@ def mount_chainlit(app: FastAPI, target: str, path="/chainlit"):
 
         If a request's path doesn't start with the configured subpath, the middleware
         returns a 404 response instead of forwarding to Chainlit's default route.
+
+        Implemented as a pure ASGI middleware so requests are streamed through
+        without the overhead of `BaseHTTPMiddleware`.
         """
 
-        async def dispatch(self, request: Request, call_next):
-            if not request.url.path.startswith(api_full_path):
-                return JSONResponse(status_code=404, content={"detail": "Not found"})
+        def __init__(self, app: ASGIApp):
+            self.app = app
+
+        async def __call__(self, scope: Scope, receive: Receive, send: Send):
+            if scope["type"] == "http" and not scope["path"].startswith(api_full_path):
+                response = JSONResponse(
+                    status_code=404, content={"detail": "Not found"}
+                )
+                await response(scope, receive, send)
+                return
 
-            return await call_next(request)
+            await self.app(scope, receive, send)
 
     chainlit_app.add_middleware(ChainlitMiddleware)
 
@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import jwt as pyjwt
+import pytest
+
+from chainlit.auth import jwt as auth_jwt
+from chainlit.auth.jwt import create_jwt, decode_jwt_cached, get_jwt_expiration
+from chainlit.user import User
+
+
+@pytest.fixture(autouse=True)
+def jwt_secret(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("CHAINLIT_AUTH_SECRET", "test-secret" * 4)
+    monkeypatch.setattr(auth_jwt, "_jwt_cache", {})
+
+
+def test_decode_jwt_cached_reuses_verified_claims():
+    token = create_jwt(User(identifier="alice", metadata={"perms": {"role": "user"}}))
+
+    with patch.object(
+        auth_jwt._jwt_decoder, "decode", wraps=auth_jwt._jwt_decoder.decode
+    ) as mock_decode:
+        first = decode_jwt_cached(token)
+        second = decode_jwt_cached(token)
+        # Callers get their own instance, nested claims included
+        second.metadata["perms"]["role"] = "admin"
+        third = decode_jwt_cached(token)
+
+    assert mock_decode.call_count == 1
+    assert first is not second
+    assert (
+        first == third == User(identifier="alice", metadata={"perms": {"role": "user"}})
+    )
+
+
+def test_decode_jwt_cached_does_not_cache_failures():
+    token = create_jwt(User(identifier="alice")) + "tampered"
+
+    for _ in range(2):
+        with pytest.raises(pyjwt.InvalidTokenError):
+            decode_jwt_cached(token)
+
+    assert auth_jwt._jwt_cache == {}
+
+
+def test_decode_jwt_cached_honours_token_expiry(monkeypatch: pytest.MonkeyPatch):
+    token = create_jwt(User(identifier="alice"))
+    decode_jwt_cached(token)
+
+    ((expires_at, _, _),) = auth_jwt._jwt_cache.values()
+    exp = pyjwt.decode(token, options={"verify_signature": False})["exp"]
+    assert expires_at <= exp
+
+    # Once the entry is stale the token goes through full verification again
+    monkeypatch.setattr(auth_jwt.time, "time", lambda: exp + 1)
+    with patch.object(
+        auth_jwt._jwt_decoder, "decode", side_effect=pyjwt.ExpiredSignatureError
+    ):
+        with pytest.raises(pyjwt.ExpiredSignatureError):
+            decode_jwt_cached(token)
+
+
+def test_get_jwt_expiration_reads_verified_claims():
+    token = create_jwt(User(identifier="alice"))
+
+    assert get_jwt_expiration(token) is None
+
+    decode_jwt_cached(token)
+
+    exp = pyjwt.decode(token, options={"verify_signature": False})["exp"]
+    with patch.object(auth_jwt._jwt_decoder, "decode") as mock_decode:
+        assert get_jwt_expiration(token) == exp
+    mock_decode.assert_not_called()
+
+
+def test_decode_jwt_cached_evicts_oldest_entry_when_full(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(auth_jwt, "_jwt_cache_maxsize", 2)
+    tokens = [create_jwt(User(identifier=name)) for name in ("a", "b", "c")]
+
+    for token in tokens:
+        decode_jwt_cached(token)
+
+    assert len(auth_jwt._jwt_cache) == 2
+    with patch.object(
+        auth_jwt._jwt_decoder, "decode", wraps=auth_jwt._jwt_decoder.decode
+    ) as mock_decode:
+        decode_jwt_cached(tokens[2])
+        assert mock_decode.call_count == 0
+        decode_jwt_cached(tokens[0])
+        assert mock_decode.call_count == 1
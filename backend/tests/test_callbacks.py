@@ -3,7 +3,10 @@ from __future__ import annotations
 import asyncio
 from unittest.mock import AsyncMock, Mock
 
+import pytest
+
 from chainlit import config
+from chainlit.auth import invalidate_auth_cache, require_login
 from chainlit.callbacks import password_auth_callback
 from chainlit.data.base import BaseDataLayer
 from chainlit.types import ThreadDict
@@ -101,6 +104,64 @@ async def test_oauth_callback(test_config: config.ChainlitConfig):
         assert result is None
 
 
+@pytest.fixture
+def auth_config(monkeypatch: pytest.MonkeyPatch, test_config: config.ChainlitConfig):
+    monkeypatch.setattr("chainlit.auth.config", test_config)
+    monkeypatch.delenv("CHAINLIT_CUSTOM_AUTH", raising=False)
+    invalidate_auth_cache()
+
+    yield test_config
+
+    invalidate_auth_cache()
+
+
+async def test_password_auth_callback_requires_login(auth_config):
+    assert not require_login()
+
+    @password_auth_callback
+    async def auth_func(username: str, password: str) -> User | None:
+        return None
+
+    assert require_login()
+
+
+async def test_header_auth_callback_requires_login(auth_config):
+    from starlette.datastructures import Headers
+
+    from chainlit.callbacks import header_auth_callback
+
+    assert not require_login()
+
+    @header_auth_callback
+    async def auth_func(headers: Headers) -> User | None:
+        return None
+
+    assert require_login()
+
+
+async def test_oauth_callback_requires_login(
+    auth_config, monkeypatch: pytest.MonkeyPatch
+):
+    from chainlit.callbacks import oauth_callback
+
+    monkeypatch.setenv("OAUTH_GITHUB_CLIENT_ID", "client_id")
+    monkeypatch.setenv("OAUTH_GITHUB_CLIENT_SECRET", "client_secret")
+
+    assert not require_login()
+
+    @oauth_callback
+    async def auth_func(
+        provider_id: str,
+        token: str,
+        raw_user_data: dict,
+        default_app_user: User,
+        id_token: str | None = None,
+    ) -> User | None:
+        return None
+
+    assert require_login()
+
+
 async def test_on_message(mock_chainlit_context, test_config: config.ChainlitConfig):
     from chainlit.callbacks import on_message
     from chainlit.message import Message
@@ -8,7 +8,11 @@ from unittest.mock import AsyncMock, Mock, create_autospec, mock_open
 import pytest
 from fastapi.testclient import TestClient
 
-from chainlit.auth import get_current_user
+from chainlit.auth import (
+    get_configuration,
+    get_current_user,
+    invalidate_auth_cache,
+)
 from chainlit.config import (
     APP_ROOT,
     ChainlitConfig,
@@ -116,6 +120,28 @@ async def test_project_settings(test_client: TestClient, mock_get_current_user:
     assert data["starters"] == []
 
 
+@pytest.fixture
+def clean_auth_cache():
+    """Don't let memoized auth settings leak in or out of a test."""
+    invalidate_auth_cache()
+
+    yield
+
+    invalidate_auth_cache()
+
+
+def test_auth_config(test_client: TestClient, clean_auth_cache):
+    response = test_client.get("/auth/config")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    configuration = get_configuration()
+    assert data["requireLogin"] == configuration["requireLogin"]
+    assert data["oauthProviders"] == list(configuration["oauthProviders"])
+    assert data["ui"] == configuration["ui"]
+
+
 def test_project_settings_path_traversal(
     test_client: TestClient,
     mock_get_current_user: Mock,
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import time
+from collections import deque
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from chainlit.session import (
+    HTTPSession,
+    WebsocketSession,
+    _fast_size,
+    clean_metadata,
+)
+from chainlit.user import User
+
+
+def test_clean_metadata_drops_non_serializable_values():
+    metadata = {"name": "test", "nested": {"obj": object(), "count": 1}}
+
+    assert clean_metadata(metadata) == {
+        "name": "test",
+        "nested": {"obj": None, "count": 1},
+    }
+
+
+def test_clean_metadata_redacts_oversized_metadata():
+    metadata = {"data": "x" * 100}
+
+    assert clean_metadata(metadata, max_size=50) == {
+        "message": "Metadata size exceeds the limit of 50 bytes. Redacted."
+    }
+
+
+def test_clean_metadata_measures_escaped_size():
+    # 2 bytes in UTF-8, but 6 once escaped as \u00e9
+    metadata = {"data": "é" * 20, "obj": object()}
+
+    assert clean_metadata(metadata, max_size=100) == {
+        "message": "Metadata size exceeds the limit of 100 bytes. Redacted."
+    }
+
+
+def test_clean_metadata_returns_json_native_metadata_as_is():
+    metadata = {"env": {}, "chat_settings": {"model": "gpt"}, "history": [1, 2.5]}
+
+    assert clean_metadata(metadata) is metadata
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["\n" * 60, '"' * 60, "é" * 30, "😀" * 20, {"é" * 30: 1}, [10**50, 10**50]],
+)
+def test_fast_size_is_an_upper_bound(value):
+    metadata = {"value": value}
+
+    assert _fast_size(metadata, 10_000) >= len(json.dumps(metadata))
+    assert clean_metadata(metadata, max_size=100) == {
+        "message": "Metadata size exceeds the limit of 100 bytes. Redacted."
+    }
+
+
+def test_fast_size_rejects_non_json_native_values():
+    with pytest.raises(TypeError):
+        _fast_size({"tuple": (1, 2)}, 1024)
+
+    with pytest.raises(TypeError):
+        _fast_size({1: "non string key"}, 1024)
+
+
+def test_fast_size_stops_past_limit():
+    metadata: dict = {"loop": []}
+    metadata["loop"].append(metadata)
+
+    assert _fast_size(metadata, 100) > 100
+
+
+def test_fast_size_rejects_non_json_native_values_before_walking_siblings():
+    metadata = {"obj": object(), "history": ["x" * 100]}
+
+    with pytest.raises(TypeError):
+        _fast_size(metadata, 10)
+
+
+@pytest.fixture
+def http_session(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr("chainlit.config.FILES_DIRECTORY", tmp_path)
+
+    return HTTPSession(id="test_session_id", client_type="webapp")
+
+
+def test_to_persistable_drops_user_before_cleaning(http_session: HTTPSession):
+    from chainlit.user_session import user_sessions
+
+    user_sessions[http_session.id] = {
+        "user": User(identifier="alice"),
+        "history": [1, 2],
+    }
+    try:
+        with patch("chainlit.session._metadata_encoder") as mock_encoder:
+            metadata = http_session.to_persistable()
+    finally:
+        del user_sessions[http_session.id]
+
+    # JSON native once the user is dropped: no serialization needed
+    mock_encoder.encode.assert_not_called()
+    assert metadata["user"] is None
+    assert metadata["history"] == [1, 2]
+
+
+async def test_persist_file_copies_path(http_session: HTTPSession, tmp_path: Path):
+    src = tmp_path / "source.txt"
+    src.write_bytes(b"hello world")
+
+    file_ref = await http_session.persist_file(
+        name="source.txt", mime="text/plain", path=str(src)
+    )
+
+    persisted = http_session.files[file_ref["id"]]
+    assert persisted["path"].read_bytes() == b"hello world"
+    assert persisted["size"] == len(b"hello world")
+
+
+async def test_persist_file_writes_content(http_session: HTTPSession):
+    file_ref = await http_session.persist_file(
+        name="note.txt", mime="text/plain", content="héllo"
+    )
+
+    persisted = http_session.files[file_ref["id"]]
+    assert persisted["path"].read_bytes() == "héllo".encode()
+    assert persisted["path"].suffix == ".txt"
+
+
+async def test_websocket_session_lookup_follows_socket_reconnection():
+    session = WebsocketSession(
+        id="ws_session_id",
+        socket_id="sid_1",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+    )
+
+    assert WebsocketSession.get("sid_1") is session
+    assert WebsocketSession.get_by_id("ws_session_id") is session
+
+    session.restore("sid_2")
+
+    assert WebsocketSession.get("sid_1") is None
+    assert WebsocketSession.require("sid_2") is session
+
+    await session.delete()
+
+    assert WebsocketSession.get("sid_2") is None
+    assert WebsocketSession.get_by_id("ws_session_id") is None
+
+
+async def test_flush_method_queue_keeps_order_per_target():
+    session = WebsocketSession(
+        id="flush_session_id",
+        socket_id="flush_sid",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+    )
+    calls = []
+
+    async def update_step(data_layer, step_dict):
+        if step_dict["output"] == "first":
+            # Give the other calls a chance to run concurrently
+            await asyncio.sleep(0.01)
+        calls.append((step_dict["id"], step_dict["output"]))
+
+    async def failing_step(data_layer, step_dict):
+        raise ValueError("boom")
+
+    session.thread_queues["update_step"] = deque(
+        [
+            (update_step, None, ({"id": "a", "output": "first"},), {}),
+            (update_step, None, ({"id": "b", "output": "other"},), {}),
+            (failing_step, None, ({"id": "c"},), {}),
+            (update_step, None, ({"id": "a", "output": "second"},), {}),
+        ]
+    )
+
+    await session.flush_method_queue()
+
+    assert calls == [("b", "other"), ("a", "first"), ("a", "second")]
+    assert not session.thread_queues["update_step"]
+
+    await session.delete()
+
+
+async def test_flush_method_queue_runs_children_after_their_parent():
+    session = WebsocketSession(
+        id="flush_tree_session_id",
+        socket_id="flush_tree_sid",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+    )
+    calls = []
+
+    async def create_step(data_layer, step_dict):
+        if step_dict["id"] == "parent":
+            await asyncio.sleep(0.01)
+        calls.append(step_dict["id"])
+
+    session.thread_queues["create_step"] = deque(
+        (create_step, None, (step_dict,), {})
+        for step_dict in (
+            {"id": "parent", "parentId": None},
+            {"id": "child", "parentId": "parent"},
+            {"id": "grandchild", "parentId": "child"},
+            {"id": "other", "parentId": "not_queued"},
+        )
+    )
+
+    await session.flush_method_queue()
+
+    assert calls == ["other", "parent", "child", "grandchild"]
+
+    await session.delete()
+
+
+async def test_flush_method_queue_caps_concurrency(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("chainlit.session._flush_concurrency", 2)
+    session = WebsocketSession(
+        id="flush_cap_session_id",
+        socket_id="flush_cap_sid",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+    )
+    running = 0
+    max_running = 0
+
+    async def update_step(data_layer, step_dict):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+
+    session.thread_queues["update_step"] = deque(
+        (update_step, None, ({"id": str(i)},), {}) for i in range(10)
+    )
+
+    await session.flush_method_queue()
+
+    assert max_running == 2
+
+    await session.delete()
+
+
+async def test_authenticate_for_reconnect_requires_same_valid_token():
+    user = User(identifier="alice")
+    session = WebsocketSession(
+        id="reconnect_session_id",
+        socket_id="reconnect_sid",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+        user=user,
+        token="session-token",
+        token_exp=time.time() + 60,
+    )
+
+    assert (
+        WebsocketSession.authenticate_for_reconnect(
+            "reconnect_session_id", "session-token"
+        )
+        is session
+    )
+    assert (
+        WebsocketSession.authenticate_for_reconnect(
+            "reconnect_session_id", "other-token"
+        )
+        is None
+    )
+    assert (
+        WebsocketSession.authenticate_for_reconnect("unknown_id", "session-token")
+        is None
+    )
+
+    session.token_exp = time.time() - 1
+    assert (
+        WebsocketSession.authenticate_for_reconnect(
+            "reconnect_session_id", "session-token"
+        )
+        is None
+    )
+
+    await session.delete()
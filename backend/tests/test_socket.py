@@ -0,0 +1,78 @@
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from chainlit.auth import jwt as auth_jwt
+from chainlit.auth.jwt import create_jwt
+from chainlit.session import WebsocketSession
+from chainlit.socket import _authenticate_connection, restore_existing_session
+from chainlit.user import User
+
+
+@pytest.fixture
+async def ws_session():
+    session = WebsocketSession(
+        id="socket_session_id",
+        socket_id="socket_sid",
+        emit=Mock(),
+        emit_call=Mock(),
+        user_env={},
+        client_type="webapp",
+        user=User(identifier="alice"),
+        token="old-token",
+        token_exp=time.time() + 60,
+    )
+
+    yield session
+
+    await session.delete()
+
+
+async def test_authenticate_connection_returns_verified_token_expiry(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("CHAINLIT_AUTH_SECRET", "test-secret" * 4)
+    monkeypatch.setattr(auth_jwt, "_jwt_cache", {})
+    token = create_jwt(User(identifier="alice"))
+    user = User(identifier="alice")
+
+    async def get_current_user(token: str):
+        # Verifies the token the way authenticate_user does
+        auth_jwt.decode_jwt_cached(token)
+        return user
+
+    monkeypatch.setattr("chainlit.socket.get_current_user", get_current_user)
+    monkeypatch.setattr("chainlit.socket._get_token", lambda environ, auth: token)
+
+    result_user, result_token, token_exp = await _authenticate_connection({}, {})
+
+    assert result_user is user
+    assert result_token == token
+    ((_, exp, _),) = auth_jwt._jwt_cache.values()
+    assert token_exp == exp
+
+
+async def test_authenticate_connection_reuses_session_on_reconnect(
+    monkeypatch: pytest.MonkeyPatch, ws_session: WebsocketSession
+):
+    get_current_user = AsyncMock()
+    monkeypatch.setattr("chainlit.socket.get_current_user", get_current_user)
+    monkeypatch.setattr("chainlit.socket._get_token", lambda environ, auth: "old-token")
+
+    result = await _authenticate_connection({}, {"sessionId": ws_session.id})
+
+    assert result == (ws_session.user, "old-token", ws_session.token_exp)
+    get_current_user.assert_not_awaited()
+
+
+async def test_restore_existing_session_updates_token(ws_session: WebsocketSession):
+    token_exp = time.time() + 120
+
+    assert restore_existing_session(
+        "new_sid", ws_session.id, Mock(), Mock(), token="new-token", token_exp=token_exp
+    )
+
+    assert WebsocketSession.get("new_sid") is ws_session
+    assert ws_session.token == "new-token"
+    assert ws_session.token_exp == token_exp
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from chainlit.config import ChainlitConfig
+from chainlit.utils import mount_chainlit
+
+
+@pytest.fixture
+def mounted_app(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, test_config: ChainlitConfig
+):
+    """Mount the chainlit app under /chainlit, undoing its global side effects."""
+    from chainlit.server import app as chainlit_app
+
+    target = tmp_path / "target.py"
+    target.write_text("import chainlit as cl\n")
+
+    monkeypatch.setenv("CHAINLIT_ROOT_PATH", str(tmp_path))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    monkeypatch.setattr(test_config.run, "module_name", None)
+    monkeypatch.setattr(test_config.run, "debug", False)
+    # Let the middleware be added to an app other tests may already have started
+    monkeypatch.setattr(chainlit_app, "middleware_stack", None)
+    monkeypatch.setattr(chainlit_app, "user_middleware", [])
+
+    app = FastAPI()
+    mount_chainlit(app, str(target), "/chainlit")
+
+    return app, chainlit_app.user_middleware[0].cls
+
+
+def test_mounted_app_serves_its_routes(mounted_app):
+    app, _ = mounted_app
+
+    response = TestClient(app).get("/chainlit/auth/config")
+
+    assert response.status_code == 200
+    assert "requireLogin" in response.json()
+
+
+def test_chainlit_middleware_rejects_paths_outside_mount(mounted_app):
+    _, middleware_cls = mounted_app
+    inner_app = AsyncMock()
+
+    response = TestClient(middleware_cls(inner_app)).get("/other/auth/config")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Not found"}
+    inner_app.assert_not_called()
+
+
+@pytest.mark.parametrize("scope_type", ["websocket", "lifespan"])
+async def test_chainlit_middleware_passes_non_http_scopes_through(
+    mounted_app, scope_type: str
+):
+    _, middleware_cls = mounted_app
+    inner_app = AsyncMock()
+    scope = {"type": scope_type, "path": "/other"}
+    receive, send = AsyncMock(), AsyncMock()
+
+    await middleware_cls(inner_app)(scope, receive, send)
+
+    inner_app.assert_awaited_once_with(scope, receive, send)